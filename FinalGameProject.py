@@ -1,451 +1,833 @@
-import random
-import copy
-
-# Class for Cards
-class Cards:
-    """
-    Represents a single playing card.
-    Each card has a suit (e.g., Diamonds, Hearts), a rank (e.g., Ace, 2, 3), and a value (e.g., 10, [1, 11] for Ace).
-    """
-    def __init__(self, suit, rank, value):
-        self.suit = suit      # The suit of the card (Diamonds, Spades, etc.)
-        self.value = value    # The value of the card (e.g., 10 for a King, [1, 11] for an Ace)
-        self.rank = rank      # The rank of the card (e.g., Ace, King, 2, 3, etc.)
-
-    def __repr__(self):
-        """
-        Defines how the card is represented as a string.
-        For example: "Ace of Spades (Value of [1, 11])"
-        """
-        return "{} of {} (Value of {})".format(self.rank, self.suit, self.value)
-
-# Class for Deck
-class Deck:
-    """
-    Represents a deck of cards. Manages operations like shuffling, dealing, and adding additional decks.
-    """
-    def __init__(self):
-        """
-        Initializes a deck of 52 cards (4 suits * 13 ranks per suit).
-        Also keeps an original copy for resetting the deck if needed.
-        """
-        self.suits = ["Diamonds", "Spades", "Clubs", "Hearts"]  # List of all possible suits
-        self.ranks = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '10': 10,
-                      'Jack': 10, 'Queen': 10, 'King': 10, 'Ace': [1, 11]}  # Rank to value mapping
-        self.cards = self._create_deck()  # Generates the initial deck of cards
-        self.original_cards = copy.deepcopy(self.cards)  # Saves a copy of the original deck for reset
-
-    def _create_deck(self):
-        """
-        Creates a deck of 52 cards based on the ranks and suits.
-        """
-        return [Cards(suit, rank, value) for suit in self.suits for rank, value in self.ranks.items()]
-
-    def shuffle(self):
-        """
-        Shuffles the deck using the random module.
-        """
-        random.shuffle(self.cards)
-
-    def dealcards(self):
-        """
-        Deals one card from the deck (removes the card from the deck).
-        Raises an error if the deck is empty.
-        """
-        if len(self.cards) == 0:
-            raise ValueError("Deck is empty, cannot deal any more cards.")
-        return self.cards.pop()
-
-    def add_additional_deck(self):
-        """
-        Adds a new deck of 52 cards to the existing deck and shuffles it.
-        """
-        additional_cards = self._create_deck()
-        self.cards.extend(additional_cards)  # Adds additional cards to the existing deck
-        self.original_cards.extend(additional_cards)  # Updates the original card list
-        print(f"Added an additional deck. Total cards now: {len(self.cards)}")
-        self.shuffle()  # Shuffle the deck after adding new cards
-
-    def __len__(self):
-        """
-        Returns the number of cards left in the deck.
-        """
-        return len(self.cards)
-
-    def __repr__(self):
-        """
-        Represents the deck by showing how many cards are remaining.
-        """
-        return f"Cards Remaining in Deck: {len(self.cards)}"
-
-# Class for Money
-class Money:
-    """
-    Handles the player's money, including placing bets, winning or losing bets.
-    """
-    def __init__(self, balance):
-        self.balance = balance  # The player's starting balance
-
-    def bet_amount(self, amount):
-        """
-        Deducts the bet amount from the player's balance.
-        Ensures the player has enough balance to place the bet.
-        """
-        if amount > self.balance:
-            raise ValueError("Not enough balance to place this bet!")
-        self.balance -= amount
-        return amount
-
-    def win_bet(self, amount):
-        """
-        Adds twice the bet amount to the player's balance when they win.
-        """
-        self.balance += amount * 2
-
-    def lose_bet(self):
-        """
-        Does nothing when the player loses the bet, as the money is already deducted when the bet is placed.
-        """
-        pass
-
-    def __repr__(self):
-        """
-        Shows the current balance of the player.
-        """
-        return f"Balance: ${self.balance}"
-
-# Class for Player
-class Player:
-    """
-    Represents a player in the game, either a regular player or the dealer.
-    Handles actions such as placing bets, managing hand, and calculating total card values.
-    """
-    def __init__(self, name, is_dealer=False, balance=10000):
-        self.name = name
-        self.is_dealer = is_dealer  # Whether the player is the dealer or not
-        self.money = Money(balance)  # Player's balance for betting
-        self.hand = []  # Player's hand (list of cards)
-        self.total = 0  # Total value of cards in hand
-        self.current_bet = 0  # The current bet placed by the player
-        self.insurance_bet = 0  # Insurance bet (if applicable)
-        self.side_bets = {}  # Dictionary for storing side bets
-
-    def add_card(self, card):
-        """
-        Adds a card to the player's hand and recalculates the total value of the hand.
-        """
-        self.hand.append(card)
-        self.calculate_total()
-
-    def calculate_total(self):
-        """
-        Calculates the total value of the player's hand.
-        Properly handles the value of Aces (either 1 or 11 depending on the total).
-        """
-        total = 0
-        aces = 0  # Count of Aces in the hand
-        for card in self.hand:
-            if isinstance(card.value, list):  # If the card is an Ace
-                aces += 1
-                total += 11  # Assume Ace is 11 at first
-            else:
-                total += card.value
-        while total > 21 and aces > 0:
-            total -= 10  # Convert an Ace from 11 to 1 if necessary
-            aces -= 1
-        self.total = total
-        return self.total
-
-    def show_hand(self):
-        """
-        Displays the player's hand and their total card value.
-        If the player is the dealer, only the first card is shown until their turn.
-        """
-        if self.is_dealer:
-            visible_hand = f"{self.hand[0]}" if len(self.hand) == 2 else ', '.join(str(card) for card in self.hand)
-            print(f"Dealer's visible card: {visible_hand}")
-        else:
-            hand_str = ', '.join([str(card) for card in self.hand])
-            print(f"{self.name}'s hand: {hand_str}. Total: {self.total}")
-
-    def place_bet(self, amount):
-        """
-        Places a bet by deducting the amount from the player's balance.
-        """
-        self.current_bet = self.money.bet_amount(amount)
-
-    def win_bet(self):
-        """
-        Player wins the bet and doubles their bet amount.
-        """
-        self.money.win_bet(self.current_bet)
-
-    def lose_bet(self):
-        """
-        Player loses the bet, no money is refunded.
-        """
-        self.money.lose_bet()
-
-class Game:
-    """
-    Main class that runs the Blackjack game.
-    Handles player turns, dealer logic, and determining the winner.
-    Now includes functionality for splitting, doubling down, and better input validation.
-    """
-    def __init__(self):
-        self.deck = Deck()  # Initialize a single deck of cards
-        self.players = []  # List of players
-        self.dealer = Player("Dealer", is_dealer=True)  # The dealer as a player
-        self.deck.shuffle()  # Shuffle the deck at the start of the game
-
-    def add_players(self, num_players):
-        """
-        Adds the specified number of players to the game by asking for their names.
-        """
-        for i in range(num_players):
-            name = input(f"Enter name for Player {i + 1}: ")
-            player = Player(name, balance=10000)  # Each player starts with $10,000
-            self.players.append(player)
-
-    def check_deck_size(self):
-        """
-        Checks if the deck size is too small based on the number of players.
-        If fewer cards are available than remaining_players * 2 + 15, a new deck is added.
-        """
-        remaining_players = len(self.players) + 1  # Including dealer
-        if len(self.deck) < remaining_players * 2 + 15:
-            print(f"Adding an additional deck due to low card count ({len(self.deck)} cards left)...")
-            self.deck.add_additional_deck()
-
-    def request_side_bets(self, player):
-        """
-        Prompts the player to place side bets and explains the rules and payout ratios.
-        """
-        print(f"\n{player.name}, you can place the following side bets:")
-
-        # Dealer Bust Bet
-        if input("Do you want to place a 'Dealer Bust' bet? (3:1 payout) (Y/N): ").lower() == 'y':
-            while True:
-                try:
-                    amount = int(input("Enter the amount to bet on Dealer Bust: "))
-                    player.money.bet_amount(amount)
-                    player.side_bets['dealer_bust'] = amount
-                    print(f"{player.name} placed a Dealer Bust bet of ${amount}.")
-                    break
-                except ValueError as e:
-                    print(e)
-        else:
-            player.side_bets['dealer_bust'] = 0
-
-        # Mixed Pair Bet
-        if input("Do you want to place a 'Mixed Pair' bet? (5:1 payout) (Y/N): ").lower() == 'y':
-            while True:
-                try:
-                    amount = int(input("Enter the amount to bet on Mixed Pair: "))
-                    player.money.bet_amount(amount)
-                    player.side_bets['mixed_pair'] = amount
-                    print(f"{player.name} placed a Mixed Pair bet of ${amount}.")
-                    break
-                except ValueError as e:
-                    print(e)
-        else:
-            player.side_bets['mixed_pair'] = 0
-
-        # Same Pair Bet
-        if input("Do you want to place a 'Same Pair' bet? (12:1 payout) (Y/N): ").lower() == 'y':
-            while True:
-                try:
-                    amount = int(input("Enter the amount to bet on Same Pair: "))
-                    player.money.bet_amount(amount)
-                    player.side_bets['same_pair'] = amount
-                    print(f"{player.name} placed a Same Pair bet of ${amount}.")
-                    break
-                except ValueError as e:
-                    print(e)
-        else:
-            player.side_bets['same_pair'] = 0
-
-    def evaluate_side_bets(self, player):
-        """
-        Evaluates whether the player wins any side bets based on their hand and the dealer's hand.
-        """
-        card1, card2 = player.hand[:2]  # The player's first two cards
-
-        # Dealer Bust Bet
-        if player.side_bets.get('dealer_bust') and self.dealer.total > 21:
-            print(f"{player.name} wins the 'Dealer Bust' side bet!")
-            player.money.win_bet(player.side_bets['dealer_bust'] * 3)
-
-        # Mixed Pair Bet
-        if player.side_bets.get('mixed_pair') and card1.rank == card2.rank and card1.suit != card2.suit:
-            print(f"{player.name} wins the 'Mixed Pair' side bet!")
-            player.money.win_bet(player.side_bets['mixed_pair'] * 5)
-
-        # Same Pair Bet
-        if player.side_bets.get('same_pair') and card1.rank == card2.rank and card1.suit == card2.suit:
-            print(f"{player.name} wins the 'Same Pair' side bet!")
-            player.money.win_bet(player.side_bets['same_pair'] * 12)
-
-    def start_round(self):
-        """
-        Starts a new round by dealing two cards to each player and the dealer.
-        Also checks deck size before dealing.
-        """
-        self.check_deck_size()  # Check if deck needs to be expanded
-        for player in self.players:
-            player.add_card(self.deck.dealcards())
-            player.add_card(self.deck.dealcards())
-            player.show_hand()  # Show each player's hand
-        self.dealer.add_card(self.deck.dealcards())
-        self.dealer.add_card(self.deck.dealcards())
-        self.dealer.show_hand()  # Show dealer's hand
-
-    def player_turn(self, player):
-        """
-        Manages a player's turn where they can choose to hit, stand, double down, or split (if allowed).
-        Returns False if the player busts (exceeds 21), otherwise True.
-        """
-        while True:
-            action = input(f"{player.name}, do you want to [H]it, [S]tand, [D]ouble Down, or [SP]lit (if allowed)? ").lower()
-
-            # Doubling down
-            if action == 'd' and len(player.hand) == 2:
-                # Player doubles the bet
-                try:
-                    player.place_bet(player.current_bet)  # Double the current bet
-                    print(f"{player.name} doubles down!")
-                    player.add_card(self.deck.dealcards())
-                    player.show_hand()
-                    return True  # Player automatically stands after doubling down
-                except ValueError as e:
-                    print(e)
-                    continue  # If not enough balance, continue with the turn
-
-            # Splitting hands
-            elif action == 'sp' and len(player.hand) == 2 and player.hand[0].rank == player.hand[1].rank:
-                print(f"{player.name} splits the hand!")
-                self.split_hand(player)
-                return True
-
-            # Hit action
-            elif action == 'h':
-                player.add_card(self.deck.dealcards())
-                player.show_hand()
-                if player.total > 21:
-                    print(f"{player.name} busted!")
-                    return False  # Player has busted
-
-            # Stand action
-            elif action == 's':
-                print(f"{player.name} stands with a total of {player.total}.")
-                return True
-
-            else:
-                print("Invalid input, please choose [H]it, [S]tand, [D]ouble Down, or [SP]lit.")
-
-    def split_hand(self, player):
-        """
-        Handles the logic for splitting a hand. The player splits their pair into two separate hands.
-        """
-        card1, card2 = player.hand
-        split_hands = [[card1], [card2]]  # Two hands after splitting
-
-        # Play each hand independently
-        for i, hand in enumerate(split_hands, start=1):
-            print(f"Playing hand {i} for {player.name}:")
-            player.hand = hand  # Play with the current hand
-            player.add_card(self.deck.dealcards())  # Deal a second card for each hand
-            player.show_hand()
-
-            # Player continues their turn with the current hand
-            if not self.player_turn(player):
-                print(f"Hand {i} busted for {player.name}.")
-
-    def dealer_turn(self):
-        """
-        Manages the dealer's turn.
-        Dealer will hit until their total is 17 or more, and then stand.
-        """
-        print("Dealer's turn...")
-        self.dealer.show_hand()
-        while self.dealer.total < 17:
-            self.dealer.add_card(self.deck.dealcards())
-            self.dealer.show_hand()
-
-    def check_winner(self, player):
-        """
-        Checks who won between the player and the dealer after all turns are complete.
-        Compares player total and dealer total to determine the result.
-        """
-        if player.total > 21:
-            print(f"{player.name} busted. Dealer wins!")
-            player.lose_bet()
-        elif self.dealer.total > 21 or player.total > self.dealer.total:
-            print(f"{player.name} wins against the dealer!")
-            player.win_bet()
-        elif player.total < self.dealer.total:
-            print(f"Dealer wins against {player.name}.")
-            player.lose_bet()
-        else:
-            print(f"{player.name} ties with the dealer. Bet returned.")
-            player.money.balance += player.current_bet  # Return bet in case of a tie
-
-    def eliminate_players(self):
-        """
-        Eliminates players who are out of money from the game.
-        """
-        self.players = [player for player in self.players if player.money.balance > 0]
-        if len(self.players) == 0:
-            print("All players are out of money. Game over!")
-
-    def play(self):
-        """
-        Main loop of the game. Handles multiple rounds and betting until all players are eliminated or choose to quit.
-        """
-        num_players = int(input("How many players are playing? "))
-        self.add_players(num_players)
-
-        while any(player.money.balance > 0 for player in self.players):
-            self.eliminate_players()
-
-            for player in self.players:
-                print(f"{player.name}, your current balance: ${player.money.balance}")
-                while True:
-                    try:
-                        bet_amount = int(input(f"{player.name}, how much would you like to bet? "))
-                        player.place_bet(bet_amount)
-                        break
-                    except ValueError as e:
-                        print(e)
-
-                # Ask the player if they want to place side bets
-                self.request_side_bets(player)
-
-            self.start_round()
-
-            for player in self.players:
-                if not self.player_turn(player):
-                    continue  # Move on if player busts
-
-            self.dealer_turn()
-
-            for player in self.players:
-                self.check_winner(player)
-                self.evaluate_side_bets(player)  # Evaluate side bets for the player
-
-            if input("Do you want to play another round? [Y/N] ").lower() != 'y':
-                print("Thanks for playing!")
-                break
-
-        self.eliminate_players()
-        if len(self.players) == 0:
-            print("All players are out of money. Game over!")
-
-
-# Start the game
-if __name__ == "__main__":
-    game = Game()
-    game.play()
-
-
-
+import random
+
+# Packed integer encoding for cards: code = (suit_index << 4) | rank_index,
+# with rank_index running 2..14 (Ace = 14). Cramming both fields into one int
+# lets the hot paths (hand totals, pair checks) use bitmask ops instead of
+# comparing strings and probing lists per card.
+SUITS = ("Diamonds", "Spades", "Clubs", "Hearts")  # All suits, indexed by suit_index
+RANKS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace')
+VALUES = (2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, [1, 11])  # Card values parallel to RANKS
+
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+RANK_INDEX = {rank: i + 2 for i, rank in enumerate(RANKS)}
+ACE_RANK = 14
+# Blackjack value for each rank_index (Ace counted as 11 up front, demoted later).
+RANK_VALUE = (0, 0, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11)
+
+def _fast_shuffle(cards, _randbits=random.getrandbits):
+    """
+    In-place Fisher-Yates shuffle that draws four 16-bit lanes out of each
+    64-bit random word and maps a lane onto a bounded index with Lemire's
+    multiply-shift trick ((lane * bound) >> 16). One getrandbits call covers
+    four swaps, where random.shuffle makes one RNG call per element.
+    The multiply-shift draw carries a worst-case bias under bound/65536
+    (well below 1% for any deck size here), which is fine for game play.
+    """
+    i = len(cards) - 1
+    while i > 0:
+        word = _randbits(64)
+        for _ in range(4):
+            j = ((word & 0xFFFF) * (i + 1)) >> 16
+            word >>= 16
+            cards[i], cards[j] = cards[j], cards[i]
+            i -= 1
+            if i <= 0:
+                return
+
+# Class for Cards
+class Cards:
+    """
+    Represents a single playing card.
+    Each card has a suit (e.g., Diamonds, Hearts), a rank (e.g., Ace, 2, 3), and a value (e.g., 10, [1, 11] for Ace).
+    """
+    __slots__ = ('suit', 'value', 'rank', 'code', 'is_ace', 'point', '_repr')
+
+    def __init__(self, suit, rank, value):
+        self.suit = suit      # The suit of the card (Diamonds, Spades, etc.)
+        self.value = value    # The value of the card (e.g., 10 for a King, [1, 11] for an Ace)
+        self.rank = rank      # The rank of the card (e.g., Ace, King, 2, 3, etc.)
+        self.code = (SUIT_INDEX[suit] << 4) | RANK_INDEX[rank]  # Packed int used by the hot paths
+        self.is_ace = isinstance(value, list)  # Ace-ness decided once here, not per total
+        self.point = 11 if self.is_ace else value  # Blackjack points with Ace counted high
+        self._repr = f"{rank} of {suit} (Value of {value})"  # Formatted once; cards are immutable
+
+    def __repr__(self):
+        """
+        Defines how the card is represented as a string.
+        For example: "Ace of Spades (Value of [1, 11])"
+        """
+        return self._repr
+
+    __str__ = __repr__  # str(card) in show_hand hits the cached string directly
+
+# The 52-card template is invariant, so build it once at import time. Cards are
+# never mutated, so every deck can share these instances instead of paying 52
+# Cards() constructions per deck created or added.
+_DECK_TEMPLATE = tuple(Cards(SUITS[s], RANKS[r], VALUES[r]) for s in range(4) for r in range(13))
+
+# Class for Deck
+class Deck:
+    """
+    Represents a deck of cards. Manages operations like shuffling, dealing, and adding additional decks.
+    """
+    def __init__(self):
+        """
+        Initializes a deck of 52 cards (4 suits * 13 ranks per suit).
+        Also keeps an original copy for resetting the deck if needed.
+        """
+        self.cards = self._create_deck()  # Generates the initial deck of cards
+        self.original_cards = list(self.cards)  # Saves a copy of the original deck for reset
+        self._idx = 0  # Position of the next card to deal; cards before it are already out
+
+    def _create_deck(self):
+        """
+        Returns a fresh 52-card deck as a copy of the shared template.
+        """
+        return list(_DECK_TEMPLATE)
+
+    def shuffle(self):
+        """
+        Shuffles the undealt portion of the deck.
+        Cards that have already been dealt out stay where they are.
+        """
+        tail = self.cards[self._idx:]
+        _fast_shuffle(tail)
+        self.cards[self._idx:] = tail
+
+    def dealcards(self):
+        """
+        Deals one card by advancing the deal index (the list itself is not mutated).
+        Raises an error if the deck is empty.
+        """
+        if self._idx >= len(self.cards):
+            raise ValueError("Deck is empty, cannot deal any more cards.")
+        card = self.cards[self._idx]
+        self._idx += 1
+        return card
+
+    def deal_batch(self, n):
+        """
+        Deals n cards in one go by advancing the deal index a single time,
+        instead of paying the per-call bookkeeping of n dealcards() calls.
+        Returns the cards as a list; raises if the deck cannot cover the batch.
+        """
+        if len(self) < n:
+            raise ValueError("Deck is empty, cannot deal any more cards.")
+        idx = self._idx
+        self._idx = idx + n
+        return self.cards[idx:self._idx]
+
+    def add_additional_deck(self):
+        """
+        Adds a new deck of 52 cards to the existing deck and shuffles it.
+        """
+        additional_cards = self._create_deck()
+        self.cards.extend(additional_cards)  # Adds additional cards to the existing deck
+        self.original_cards.extend(additional_cards)  # Updates the original card list
+        print(f"Added an additional deck. Total cards now: {len(self)}")
+        self.shuffle()  # Mixes the new cards into the undealt portion
+
+    def __len__(self):
+        """
+        Returns the number of cards left to deal.
+        """
+        return len(self.cards) - self._idx
+
+    def __repr__(self):
+        """
+        Represents the deck by showing how many cards are remaining.
+        """
+        return f"Cards Remaining in Deck: {len(self)}"
+
+# Class for Money
+class Money:
+    """
+    Handles the player's money, including placing bets, winning or losing bets.
+    """
+    __slots__ = ('balance',)
+
+    def __init__(self, balance):
+        self.balance = balance  # The player's starting balance
+
+    def bet_amount(self, amount):
+        """
+        Deducts the bet amount from the player's balance.
+        Ensures the player has enough balance to place the bet.
+        """
+        if amount > self.balance:
+            raise ValueError("Not enough balance to place this bet!")
+        self.balance -= amount
+        return amount
+
+    def win_bet(self, amount):
+        """
+        Adds twice the bet amount to the player's balance when they win.
+        """
+        self.balance += amount * 2
+
+    def lose_bet(self):
+        """
+        Does nothing when the player loses the bet, as the money is already deducted when the bet is placed.
+        """
+        pass
+
+    def __repr__(self):
+        """
+        Shows the current balance of the player.
+        """
+        return f"Balance: ${self.balance}"
+
+# Class for Player
+class Player:
+    """
+    Represents a player in the game, either a regular player or the dealer.
+    Handles actions such as placing bets, managing hand, and calculating total card values.
+    """
+    __slots__ = ('name', 'is_dealer', 'money', 'hand', 'total',
+                 '_raw_total', '_aces', 'current_bet', 'insurance_bet',
+                 'bet_dealer_bust', 'bet_mixed_pair', 'bet_same_pair')
+
+    def __init__(self, name, is_dealer=False, balance=10000):
+        self.name = name
+        self.is_dealer = is_dealer  # Whether the player is the dealer or not
+        self.money = Money(balance)  # Player's balance for betting
+        self.hand = []  # Player's hand (list of cards)
+        self.total = 0  # Total value of cards in hand
+        self._raw_total = 0  # Running total with every Ace counted as 11
+        self._aces = 0  # Number of Aces still counted as 11-demotable
+        self.current_bet = 0  # The current bet placed by the player
+        self.insurance_bet = 0  # Insurance bet (if applicable)
+        self.bet_dealer_bust = 0  # Side bet on the dealer busting (3:1)
+        self.bet_mixed_pair = 0  # Side bet on an off-suit pair (5:1)
+        self.bet_same_pair = 0  # Side bet on a suited pair (12:1)
+
+    def add_card(self, card):
+        """
+        Adds a card to the player's hand and updates the running total.
+        Only the new card is inspected, so dealing is O(1) per card
+        instead of rescanning the whole hand.
+        """
+        self.hand.append(card)
+        self._raw_total += card.point  # Ace counts as 11 at first
+        self._aces += card.is_ace
+        self._normalize_total()
+
+    def _normalize_total(self):
+        """
+        Derives self.total from the running raw total, demoting Aces from 11
+        to 1 as needed. The running counters are left untouched so this can
+        be re-run after every card.
+        """
+        total = self._raw_total
+        aces = self._aces
+        if aces:  # No Aces means nothing to demote, skip the loop entirely
+            while total > 21 and aces > 0:
+                total -= 10  # Convert an Ace from 11 to 1 if necessary
+                aces -= 1
+        self.total = total
+
+    def calculate_total(self):
+        """
+        Recomputes the running totals from the full hand. Only needed when
+        the hand is replaced wholesale (e.g. after a split); normal dealing
+        goes through add_card's incremental update.
+        """
+        raw = 0
+        aces = 0  # Count of Aces in the hand
+        for card in self.hand:
+            raw += card.point  # Ace counts as 11 at first
+            aces += card.is_ace
+        self._raw_total = raw
+        self._aces = aces
+        self._normalize_total()
+        return self.total
+
+    def show_hand(self):
+        """
+        Displays the player's hand and their total card value.
+        If the player is the dealer, only the first card is shown until their turn.
+        """
+        if self.is_dealer:
+            visible_hand = f"{self.hand[0]}" if len(self.hand) == 2 else ', '.join(str(card) for card in self.hand)
+            print(f"Dealer's visible card: {visible_hand}")
+        else:
+            hand_str = ', '.join([str(card) for card in self.hand])
+            print(f"{self.name}'s hand: {hand_str}. Total: {self.total}")
+
+    def place_bet(self, amount):
+        """
+        Places a bet by deducting the amount from the player's balance.
+        """
+        self.current_bet = self.money.bet_amount(amount)
+
+    def win_bet(self):
+        """
+        Player wins the bet and doubles their bet amount.
+        """
+        self.money.win_bet(self.current_bet)
+
+    def lose_bet(self):
+        """
+        Player loses the bet, no money is refunded.
+        """
+        self.money.lose_bet()
+
+def input_policy(player, dealer_upcard):
+    """
+    Interactive policy: asks the player at the terminal what to do.
+    Returns one of the action strings 'h', 's', 'd' or 'sp'.
+    """
+    return input(f"{player.name}, do you want to [H]it, [S]tand, [D]ouble Down, or [SP]lit (if allowed)? ").strip().lower()
+
+def basic_strategy_policy(player, dealer_upcard):
+    """
+    Simplified basic strategy for non-interactive play (simulations, EV
+    studies): split Aces and 8s, double on a hard 11 when the bankroll can
+    cover the extra bet, hit soft totals to 18, stand on hard 17+, and
+    otherwise stand against a weak dealer upcard (6 or less) from hard 12
+    up. The bankroll check matters because this policy is stateless: if it
+    kept answering 'd' with no balance left, _do_double would refuse the
+    bet and player_turn would ask it again forever.
+    """
+    up = RANK_VALUE[dealer_upcard.code & 0xF]
+    total = player.total
+    if len(player.hand) == 2:
+        rank1 = player.hand[0].code & 0xF
+        if rank1 == (player.hand[1].code & 0xF) and (player.hand[0].is_ace or rank1 == 8):
+            return 'sp'
+        if total == 11 and not player._aces and player.money.balance >= player.current_bet:
+            return 'd'
+    soft = player._aces > (player._raw_total - total) // 10  # An Ace still counted as 11
+    if soft:
+        return 'h' if total < 18 else 's'
+    if total <= 11:
+        return 'h'
+    if total >= 17:
+        return 's'
+    return 's' if up <= 6 else 'h'
+
+# ---------------------------------------------------------------------------
+# Split-hand EV analysis.
+# Recursively evaluating a split revisits huge numbers of hands that differ
+# only by card order, so hands are keyed here by their rank composition (a
+# 13-slot count tuple, index = rank_index - 2) and every EV is memoized on
+# first visit, turning the traversal into table lookups. Card removal is
+# ignored (infinite-deck approximation: each rank draws at 1/13), which keeps
+# the recursion closed over compositions; good enough for quick EV estimates,
+# not for live play.
+
+_DRAW_RANKS = tuple(range(2, 15))  # rank_index of every drawable rank
+
+def _hand_counts(hand):
+    """
+    Returns the rank composition of a hand of Cards as a 13-slot count tuple.
+    """
+    counts = [0] * 13
+    for card in hand:
+        counts[(card.code & 0xF) - 2] += 1
+    return tuple(counts)
+
+def _counts_total(counts):
+    """
+    Total and softness of a composition, with Ace demotion applied.
+    """
+    total = sum(RANK_VALUE[i + 2] * n for i, n in enumerate(counts))
+    aces = counts[ACE_RANK - 2]
+    if aces:
+        while total > 21 and aces:
+            total -= 10
+            aces -= 1
+    return total, aces > 0
+
+_DEALER_CACHE = {}
+
+def _dealer_totals(counts):
+    """
+    Distribution of the dealer's final total starting from the given
+    composition, hitting below 17 (busts are lumped together as 22).
+    """
+    result = _DEALER_CACHE.get(counts)
+    if result is not None:
+        return result
+    total, _ = _counts_total(counts)
+    if total >= 17:
+        result = {min(total, 22): 1.0}
+    else:
+        result = {}
+        for rank in _DRAW_RANKS:
+            nxt = list(counts)
+            nxt[rank - 2] += 1
+            for t, p in _dealer_totals(tuple(nxt)).items():
+                result[t] = result.get(t, 0.0) + p / 13.0
+    _DEALER_CACHE[counts] = result
+    return result
+
+_HAND_CACHE = {}
+
+def _hand_ev(counts, dealer_up):
+    """
+    Memoized EV (per unit staked) of playing out a composition against the
+    dealer upcard rank, hitting/standing the same way basic_strategy_policy
+    does. Recurses only on a cache miss; identical compositions reached by
+    different card orders all hit the same entry.
+    """
+    key = (counts, dealer_up)
+    ev = _HAND_CACHE.get(key)
+    if ev is not None:
+        return ev
+    total, soft = _counts_total(counts)
+    if total > 21:
+        ev = -1.0
+    else:
+        if soft:
+            hit = total < 18
+        elif total <= 11:
+            hit = True
+        elif total >= 17:
+            hit = False
+        else:
+            hit = RANK_VALUE[dealer_up] > 6
+        if hit:
+            ev = 0.0
+            for rank in _DRAW_RANKS:
+                nxt = list(counts)
+                nxt[rank - 2] += 1
+                ev += _hand_ev(tuple(nxt), dealer_up) / 13.0
+        else:
+            dealer_start = [0] * 13
+            dealer_start[dealer_up - 2] = 1
+            ev = 0.0
+            for t, p in _dealer_totals(tuple(dealer_start)).items():
+                if t > 21 or total > t:
+                    ev += p
+                elif total < t:
+                    ev -= p
+    _HAND_CACHE[key] = ev
+    return ev
+
+_SPLIT_CACHE = {}
+
+def evaluate_split(hand_counts, dealer_up):
+    """
+    Memoized EV of one hand of a split: hand_counts is the composition
+    holding the single retained card, which draws its second card and is
+    then played out against dealer_up (a rank_index, 2..14).
+    """
+    key = (hand_counts, dealer_up)
+    ev = _SPLIT_CACHE.get(key)
+    if ev is None:
+        ev = 0.0
+        for rank in _DRAW_RANKS:
+            nxt = list(hand_counts)
+            nxt[rank - 2] += 1
+            ev += _hand_ev(tuple(nxt), dealer_up) / 13.0
+        _SPLIT_CACHE[key] = ev
+    return ev
+
+# Packed codes for the 52-card template, for simulation paths that never
+# need the Cards objects at all.
+_DECK_CODES = tuple(card.code for card in _DECK_TEMPLATE)
+
+MAX_HAND = 12  # A hand can never legally exceed 12 cards (twelve Aces on 21)
+
+def _hand_total(codes, _rank_value=RANK_VALUE):
+    """
+    Totals a sequence of packed card codes with Ace demotion applied.
+    Returns (total, aces), where aces counts the Aces still worth 11 --
+    so aces > 0 means the hand is soft. A pure integer loop with no
+    object traffic, shared by the simulation paths.
+    """
+    total = aces = 0
+    for code in codes:
+        rank = code & 0xF
+        total += _rank_value[rank]
+        if rank == ACE_RANK:
+            aces += 1
+    if aces:
+        while total > 21 and aces:
+            total -= 10
+            aces -= 1
+    return total, aces
+
+def _dealer_play(deck, idx, card1, card2, _rank_value=RANK_VALUE):
+    """
+    Plays out the dealer's hand from its two dealt codes, hitting below 17
+    against deck[idx:]. Returns (final_total, new_idx). Like _hand_total
+    this is integers-only, so the whole dealer turn runs without touching
+    a single Cards object.
+    """
+    total, aces = _hand_total((card1, card2))
+    while total < 17:
+        rank = deck[idx] & 0xF
+        idx += 1
+        total += _rank_value[rank]
+        if rank == ACE_RANK:
+            aces += 1
+        if aces:
+            while total > 21 and aces:
+                total -= 10
+                aces -= 1
+    return total, idx
+
+def simulate_rounds(num_rounds, bet=1):
+    """
+    Plays num_rounds of heads-up blackjack back to back and returns the
+    aggregate results -- the data layout the interactive Game is the wrong
+    shape for. The player's cards land in a fixed-capacity buffer reused
+    across rounds (the live hand is hand[:n]), totals come from _hand_total
+    scans of that slice, and no Cards objects or other per-round structures
+    are built, so this is the entry point for EV or bet-sizing studies that
+    need millions of rounds. The player hits and stands the
+    same way basic_strategy_policy does; splits and doubles are left out.
+    Returns a dict with wins, losses, pushes and net units won.
+    """
+    deck = list(_DECK_CODES)
+    idx = len(deck)  # Forces a shuffle before the first round
+    hand = [0] * MAX_HAND  # Reusable player-hand buffer; rewound each round, never reallocated
+    wins = losses = pushes = net = 0
+    rank_value = RANK_VALUE  # Local bindings keep the inner loops tight
+    for _ in range(num_rounds):
+        if len(deck) - idx < 15:
+            _fast_shuffle(deck)
+            idx = 0
+        hand[0] = deck[idx]
+        hand[1] = deck[idx + 1]
+        d1, d2 = deck[idx + 2], deck[idx + 3]
+        idx += 4
+        n = 2  # Cards held in the buffer; the round's hand is hand[:n]
+        up = rank_value[d1 & 0xF]
+        # Player plays out the hand, re-totalling the buffer at each decision
+        while True:
+            total, aces = _hand_total(hand[:n])
+            if total > 21:
+                break
+            if aces:
+                if total >= 18:
+                    break
+            elif total > 11 and (total >= 17 or up <= 6):
+                break
+            hand[n] = deck[idx]
+            n += 1
+            idx += 1
+        if total > 21:
+            losses += 1
+            net -= bet
+            continue
+        dtotal, idx = _dealer_play(deck, idx, d1, d2)
+        if dtotal > 21 or total > dtotal:
+            wins += 1
+            net += bet
+        elif total < dtotal:
+            losses += 1
+            net -= bet
+        else:
+            pushes += 1
+    return {'rounds': num_rounds, 'wins': wins, 'losses': losses, 'pushes': pushes, 'net': net}
+
+class Game:
+    """
+    Main class that runs the Blackjack game.
+    Handles player turns, dealer logic, and determining the winner.
+    Now includes functionality for splitting, doubling down, and better input validation.
+    """
+    _INVALID_ACTION = "Invalid input, please choose [H]it, [S]tand, [D]ouble Down, or [SP]lit."
+
+    def __init__(self, verbose=True):
+        self.deck = Deck()  # Initialize a single deck of cards
+        self.players = []  # List of players
+        self.dealer = Player("Dealer", is_dealer=True)  # The dealer as a player
+        self.verbose = verbose  # When False (simulation mode), hands are not rendered
+        # Action dispatch for player turns: one dict lookup replaces the old if/elif chain
+        self._actions = {'h': self._do_hit, 's': self._do_stand, 'd': self._do_double, 'sp': self._do_split}
+        self.deck.shuffle()  # Shuffle the deck at the start of the game
+
+    def _show(self, player):
+        """
+        Renders a player's hand unless the game is running non-interactively,
+        where string formatting per card per turn is pure overhead.
+        """
+        if self.verbose:
+            player.show_hand()
+
+    def add_players(self, num_players):
+        """
+        Adds the specified number of players to the game by asking for their names.
+        """
+        for i in range(num_players):
+            name = input(f"Enter name for Player {i + 1}: ")
+            player = Player(name, balance=10000)  # Each player starts with $10,000
+            self.players.append(player)
+
+    def check_deck_size(self):
+        """
+        Checks if the deck size is too small based on the number of players.
+        If fewer cards are available than remaining_players * 2 + 15, a new deck is added.
+        """
+        cards_left = len(self.deck)
+        needed = (len(self.players) + 1) * 2 + 15  # Two cards per seat (incl. dealer) plus hit headroom
+        if cards_left < needed:
+            print(f"Adding an additional deck due to low card count ({cards_left} cards left)...")
+            self.deck.add_additional_deck()
+
+    def request_side_bets(self, player):
+        """
+        Prompts the player to place side bets and explains the rules and payout ratios.
+        """
+        print(f"\n{player.name}, you can place the following side bets:")
+
+        # Dealer Bust Bet
+        if input("Do you want to place a 'Dealer Bust' bet? (3:1 payout) (Y/N): ").lower() == 'y':
+            while True:
+                try:
+                    amount = int(input("Enter the amount to bet on Dealer Bust: "))
+                    player.money.bet_amount(amount)
+                    player.bet_dealer_bust = amount
+                    print(f"{player.name} placed a Dealer Bust bet of ${amount}.")
+                    break
+                except ValueError as e:
+                    print(e)
+        else:
+            player.bet_dealer_bust = 0
+
+        # Mixed Pair Bet
+        if input("Do you want to place a 'Mixed Pair' bet? (5:1 payout) (Y/N): ").lower() == 'y':
+            while True:
+                try:
+                    amount = int(input("Enter the amount to bet on Mixed Pair: "))
+                    player.money.bet_amount(amount)
+                    player.bet_mixed_pair = amount
+                    print(f"{player.name} placed a Mixed Pair bet of ${amount}.")
+                    break
+                except ValueError as e:
+                    print(e)
+        else:
+            player.bet_mixed_pair = 0
+
+        # Same Pair Bet
+        if input("Do you want to place a 'Same Pair' bet? (12:1 payout) (Y/N): ").lower() == 'y':
+            while True:
+                try:
+                    amount = int(input("Enter the amount to bet on Same Pair: "))
+                    player.money.bet_amount(amount)
+                    player.bet_same_pair = amount
+                    print(f"{player.name} placed a Same Pair bet of ${amount}.")
+                    break
+                except ValueError as e:
+                    print(e)
+        else:
+            player.bet_same_pair = 0
+
+    def evaluate_side_bets(self, player):
+        """
+        Evaluates whether the player wins any side bets based on their hand and the dealer's hand.
+        """
+        code1, code2 = player.hand[0].code, player.hand[1].code  # The player's first two cards
+        same_rank = (code1 & 0xF) == (code2 & 0xF)
+        same_suit = (code1 >> 4) == (code2 >> 4)
+
+        # Dealer Bust Bet
+        if player.bet_dealer_bust and self.dealer.total > 21:
+            print(f"{player.name} wins the 'Dealer Bust' side bet!")
+            player.money.win_bet(player.bet_dealer_bust * 3)
+
+        # Mixed Pair Bet
+        if player.bet_mixed_pair and same_rank and not same_suit:
+            print(f"{player.name} wins the 'Mixed Pair' side bet!")
+            player.money.win_bet(player.bet_mixed_pair * 5)
+
+        # Same Pair Bet
+        if player.bet_same_pair and same_rank and same_suit:
+            print(f"{player.name} wins the 'Same Pair' side bet!")
+            player.money.win_bet(player.bet_same_pair * 12)
+
+    def start_round(self):
+        """
+        Starts a new round by dealing two cards to each player and the dealer.
+        Also checks deck size before dealing.
+        """
+        self.check_deck_size()  # Check if deck needs to be expanded
+        cards = self.deck.deal_batch(2 * (len(self.players) + 1))  # One batch for every seat
+        pos = 0
+        for player in self.players:
+            player.add_card(cards[pos])
+            player.add_card(cards[pos + 1])
+            pos += 2
+            self._show(player)  # Show each player's hand
+        self.dealer.add_card(cards[pos])
+        self.dealer.add_card(cards[pos + 1])
+        self._show(self.dealer)  # Show dealer's hand
+
+    def player_turn(self, player, policy=None):
+        """
+        Manages a player's turn where they can choose to hit, stand, double down, or split (if allowed).
+        The choice comes from a policy callable (player, dealer_upcard) -> action string,
+        defaulting to the interactive input_policy; simulations can pass
+        e.g. basic_strategy_policy to drive turns without any I/O.
+        Returns False if the player busts (exceeds 21), otherwise True.
+        """
+        if policy is None:
+            policy = input_policy
+        actions = self._actions
+        while True:
+            fn = actions.get(policy(player, self.dealer.hand[0]))
+            if fn is None:
+                print(self._INVALID_ACTION)
+                continue
+            result = fn(player, policy)
+            if result is not None:
+                return result
+
+    def _do_hit(self, player, policy):
+        """
+        Deals one card; ends the turn (returning False) only on a bust.
+        """
+        player.add_card(self.deck.dealcards())
+        self._show(player)
+        if player.total > 21:
+            print(f"{player.name} busted!")
+            return False  # Player has busted
+        return None
+
+    def _do_stand(self, player, policy):
+        """
+        Ends the turn with the current total.
+        """
+        print(f"{player.name} stands with a total of {player.total}.")
+        return True
+
+    def _do_double(self, player, policy):
+        """
+        Doubles the bet and deals exactly one more card, if allowed.
+        """
+        if len(player.hand) != 2:
+            print(self._INVALID_ACTION)
+            return None
+        try:
+            player.place_bet(player.current_bet)  # Double the current bet
+        except ValueError as e:
+            print(e)
+            return None  # If not enough balance, continue with the turn
+        print(f"{player.name} doubles down!")
+        player.add_card(self.deck.dealcards())
+        self._show(player)
+        return True  # Player automatically stands after doubling down
+
+    def _do_split(self, player, policy):
+        """
+        Splits a pair into two separately played hands, if allowed.
+        """
+        if len(player.hand) != 2 or (player.hand[0].code & 0xF) != (player.hand[1].code & 0xF):
+            print(self._INVALID_ACTION)
+            return None
+        print(f"{player.name} splits the hand!")
+        self.split_hand(player, policy)
+        return True
+
+    def split_hand(self, player, policy=None):
+        """
+        Handles the logic for splitting a hand. The player splits their pair into two separate hands.
+        Each hand is played out under the same policy as the original turn.
+        """
+        card1, card2 = player.hand
+        split_hands = [[card1], [card2]]  # Two hands after splitting
+
+        # Play each hand independently
+        for i, hand in enumerate(split_hands, start=1):
+            print(f"Playing hand {i} for {player.name}:")
+            player.hand = hand  # Play with the current hand
+            player.calculate_total()  # Resync the running totals for the replacement hand
+            player.add_card(self.deck.dealcards())  # Deal a second card for each hand
+            self._show(player)
+
+            # Player continues their turn with the current hand
+            if not self.player_turn(player, policy):
+                print(f"Hand {i} busted for {player.name}.")
+
+    def dealer_turn(self):
+        """
+        Manages the dealer's turn.
+        Dealer will hit until their total is 17 or more, and then stand.
+        """
+        print("Dealer's turn...")
+        self._show(self.dealer)
+        while self.dealer.total < 17:
+            self.dealer.add_card(self.deck.dealcards())
+            self._show(self.dealer)
+
+    def check_winner(self, player):
+        """
+        Checks who won between the player and the dealer after all turns are complete.
+        Compares player total and dealer total to determine the result.
+        """
+        if player.total > 21:
+            print(f"{player.name} busted. Dealer wins!")
+            player.lose_bet()
+        elif self.dealer.total > 21 or player.total > self.dealer.total:
+            print(f"{player.name} wins against the dealer!")
+            player.win_bet()
+        elif player.total < self.dealer.total:
+            print(f"Dealer wins against {player.name}.")
+            player.lose_bet()
+        else:
+            print(f"{player.name} ties with the dealer. Bet returned.")
+            player.money.balance += player.current_bet  # Return bet in case of a tie
+
+    def eliminate_players(self):
+        """
+        Eliminates players who are out of money from the game.
+        """
+        self.players = [player for player in self.players if player.money.balance > 0]
+        if len(self.players) == 0:
+            print("All players are out of money. Game over!")
+
+    def play(self):
+        """
+        Main loop of the game. Handles multiple rounds and betting until all players are eliminated or choose to quit.
+        """
+        num_players = int(input("How many players are playing? "))
+        self.add_players(num_players)
+
+        while any(player.money.balance > 0 for player in self.players):
+            self.eliminate_players()
+
+            for player in self.players:
+                print(f"{player.name}, your current balance: ${player.money.balance}")
+                while True:
+                    try:
+                        bet_amount = int(input(f"{player.name}, how much would you like to bet? "))
+                        player.place_bet(bet_amount)
+                        break
+                    except ValueError as e:
+                        print(e)
+
+                # Ask the player if they want to place side bets
+                self.request_side_bets(player)
+
+            self.start_round()
+
+            for player in self.players:
+                if not self.player_turn(player):
+                    continue  # Move on if player busts
+
+            self.dealer_turn()
+
+            for player in self.players:
+                self.check_winner(player)
+                self.evaluate_side_bets(player)  # Evaluate side bets for the player
+
+            if input("Do you want to play another round? [Y/N] ").lower() != 'y':
+                print("Thanks for playing!")
+                break
+
+        self.eliminate_players()
+        if len(self.players) == 0:
+            print("All players are out of money. Game over!")
+
+
+# Start the game
+if __name__ == "__main__":
+    game = Game()
+    game.play()
+
+
+